@@ -7,36 +7,55 @@
 #     "pydantic>=2.0.0",
 #     "asyncio",
 #     "jinja2>=3.1.0",
-#     "py-zerox",
-#     "pdf2image",
-#     "pillow",
+#     "pymupdf>=1.24",
 #     "quantalogic",
 #     "instructor>=0.5.2",
 #     "typer>=0.9.0",
 #     "rich>=13.0.0",
-#     "pyperclip>=1.8.2"
+#     "pyperclip>=1.8.2",
+#     "aiofiles>=23",
+#     "httpx[http2]>=0.27",
+#     "orjson>=3.9"
 # ]
 # ///
-# System dependencies:
-# - poppler (for pdf2image): brew install poppler (macOS) or apt-get install poppler-utils (Linux)
 
 import asyncio
+import atexit
+import base64
+import hashlib
+import io
 import os
+import re
+import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Annotated, List, Optional, Union
+from typing import Annotated, List, Optional, Type, Union
 
+import aiofiles
+import httpx
+import litellm
+import orjson
+import pymupdf
 import pyperclip
 import typer
+from litellm import acompletion
 from loguru import logger
-from pydantic import BaseModel
-from pyzerox import zerox
+from pydantic import BaseModel, ConfigDict, ValidationError
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from quantalogic.flow.flow import Nodes, Workflow
 
+# Log warnings and errors only unless LOG_LEVEL (or --verbose) asks for more
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").upper()
+try:
+    logger.level(LOG_LEVEL)
+except ValueError:
+    LOG_LEVEL = "WARNING"
+logger.remove()
+logger.add(sys.stderr, level=LOG_LEVEL)
+
 # Initialize Typer app and rich console
 app = typer.Typer(help="Convert a file (PDF, text, or Markdown) to a LinkedIn post using LLMs")
 console = Console()
@@ -48,18 +67,206 @@ DEFAULT_CLEANING_MODEL = "gemini/gemini-2.0-flash"
 #DEFAULT_WRITING_MODEL = "openrouter/openai/gpt-4o-mini"
 DEFAULT_WRITING_MODEL = "openrouter/deepseek/deepseek-r1"
 
+# Bump whenever a prompt template changes so stale cached LLM outputs are not reused
+PROMPT_VERSION = "1"
+LLM_CACHE_DIR = Path("~/.cache/analyze_paper").expanduser()
+FINAL_CACHE_DIR = LLM_CACHE_DIR / "final"
+
+# Resolution used to rasterize PDF pages for the vision model
+PDF_RENDER_DPI = 150
+# Number of pages sent to the vision model concurrently
+PDF_PAGE_BATCH_SIZE = 10
+# Connection pool of the process-wide HTTP client below
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+HTTP_TIMEOUT = 120
+# Slice size used when writing large markdown files
+WRITE_CHUNK_SIZE = 64 * 1024
+
+# One HTTP/2 client for the whole process. litellm only uses aclient_session in its
+# OpenAI-compatible handlers (openai/*, openrouter/*, ...); Gemini and other native
+# handlers build their own clients. It stays open until exit because litellm caches
+# the provider clients it wraps around it.
+HTTP_CLIENT = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+litellm.aclient_session = HTTP_CLIENT
+
+@atexit.register
+def _close_http_client() -> None:
+    """Close the shared HTTP client when the interpreter exits."""
+    try:
+        asyncio.run(HTTP_CLIENT.aclose())
+    except Exception as e:
+        # Pooled connections may belong to an event loop that is already closed
+        logger.debug("Could not close the shared HTTP client cleanly: {}", e)
+
+# Single-pass pattern for clean_markdown_syntax; alternatives are tried in order at each position
+_MD_CLEAN = re.compile(
+    r'(?P<code>```[^\n]*\n(?s:(?P<code_text>.*?))\n```)'
+    r'|(?P<hr>^\s*[-*_]{3,}\s*$)'
+    r'|(?P<hdr>^#+\s+)'
+    r'|(?P<bq>^>\s+)'
+    r'|(?P<bold>\*\*(?P<bold_text>.*?)\*\*)'
+    r'|(?P<ital>\*(?P<ital_text>.*?)\*)'
+    r'|(?P<und>_(?P<und_text>.*?)_)'
+    r'|(?P<ic>`(?P<ic_text>[^`]*)`)'
+    r'|(?P<link>\[(?P<link_text>[^\]]+)\]\([^)]+\))'
+    r'|(?P<html><[^>]+>)',
+    re.MULTILINE
+)
+# Vision models often wrap a page's markdown in a ```markdown fence
+_RE_MD_FENCE = re.compile(r'^\s*```(?:markdown)?\n(.*?)\n?```\s*$', re.DOTALL)
+# Replacement for markers that are dropped entirely; other groups keep their inner text
+_MD_CLEAN_REPLACEMENTS = {"hr": "\n", "hdr": "", "bq": "", "html": ""}
+
+def _md_clean_sub(match: re.Match) -> str:
+    """Replace one markdown construct matched by _MD_CLEAN."""
+    name = match.lastgroup
+    if name in _MD_CLEAN_REPLACEMENTS:
+        return _MD_CLEAN_REPLACEMENTS[name]
+    # Inner text may itself contain markup (e.g. a link inside bold)
+    return _MD_CLEAN.sub(_md_clean_sub, match.group(f"{name}_text"))
+
 # Define a Pydantic model for structured output of title and authors
 class PaperInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str
     authors: List[str]
 
+# LLM output cache: one JSON file per sha256(model|prompt_version|input) key
+def llm_cache_get(key: str) -> Optional[str]:
+    """Return the cached LLM response for a key, or None on a miss."""
+    cache_path = LLM_CACHE_DIR / f"{key}.json"
+    try:
+        return orjson.loads(cache_path.read_bytes())["response"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable cache entry {}: {}", cache_path, e)
+        llm_cache_evict(key)
+        return None
+
+def llm_cache_set(key: str, value: str, model: str) -> None:
+    """Store an LLM response under a key."""
+    cache_path = LLM_CACHE_DIR / f"{key}.json"
+    entry = {
+        "model": model,
+        "prompt_version": PROMPT_VERSION,
+        "sha256": key,
+        "response": value,
+        "utc_ts": datetime.now(timezone.utc),
+    }
+    try:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(orjson.dumps(entry, option=orjson.OPT_UTC_Z))
+    except OSError as e:
+        logger.warning("Could not write cache entry {}: {}", cache_path, e)
+
+def llm_cache_evict(key: str) -> None:
+    """Remove a cache entry if it exists."""
+    (LLM_CACHE_DIR / f"{key}.json").unlink(missing_ok=True)
+
+# Whole-pipeline cache: final post keyed on the input file path, its bytes and the run settings
+def file_sha256(file_path: str) -> str:
+    """Hash a file's length and content in 1 MiB chunks."""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        h.update(os.fstat(f.fileno()).st_size.to_bytes(8, "little"))
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def final_cache_get(key: str) -> Optional[dict]:
+    """Return the cached workflow result for a key, or None on a miss."""
+    cache_path = FINAL_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+    try:
+        entry = orjson.loads(cache_path.read_bytes())
+        if not entry.get("post_content"):
+            raise KeyError("post_content")
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable cache entry {}: {}", cache_path, e)
+        cache_path.unlink(missing_ok=True)
+        return None
+    # The replay reports the saved markdown and draft files, so they must still exist
+    for path_key in ("markdown_file_path", "draft_post_file_path"):
+        if not entry.get(path_key) or not os.path.isfile(entry[path_key]):
+            logger.info("Cached {} is gone; regenerating", path_key)
+            return None
+    return entry
+
+def final_cache_set(key: str, result: dict) -> None:
+    """Store the parts of a workflow result needed to replay it."""
+    cache_path = FINAL_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+    entry = {
+        "post_content": result["post_content"],
+        "markdown_file_path": result.get("markdown_file_path"),
+        "draft_post_file_path": result.get("draft_post_file_path"),
+        "utc_ts": datetime.now(timezone.utc),
+    }
+    try:
+        FINAL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(orjson.dumps(entry, option=orjson.OPT_UTC_Z))
+    except OSError as e:
+        logger.warning("Could not write cache entry {}: {}", cache_path, e)
+
+def cached_llm_node(response_model: Optional[Type[BaseModel]] = None):
+    """Decorator caching the output of an LLM node on disk.
+
+    Must be applied on top of Nodes.llm_node/structured_llm_node. The wrapper
+    replaces the node in the registry and adds a `use_cache` input read from
+    the workflow context.
+    """
+    def decorator(node_func):
+        name = next(n for n, (f, _, _) in Nodes.NODE_REGISTRY.items() if f is node_func)
+        _, inputs, output = Nodes.NODE_REGISTRY[name]
+
+        async def wrapped_func(use_cache: bool = True, **kwargs):
+            if not use_cache:
+                return await node_func(**kwargs)
+
+            model = kwargs.get("model")
+            input_bytes = orjson.dumps(
+                {"node": name, **{k: v for k, v in kwargs.items() if k != "model"}},
+                default=str,
+                option=orjson.OPT_SORT_KEYS,
+            )
+            h = hashlib.sha256(f"{model}|{PROMPT_VERSION}|".encode())
+            h.update(input_bytes)
+            key = h.hexdigest()
+
+            cached = llm_cache_get(key)
+            if cached is not None:
+                if response_model is None:
+                    logger.debug("Cache hit for {} ({})", name, key[:12])
+                    return cached
+                try:
+                    result = response_model.model_validate_json(cached)
+                    logger.debug("Cache hit for {} ({})", name, key[:12])
+                    return result
+                except ValidationError:
+                    logger.warning("Cached {} for {} no longer validates; refetching", response_model.__name__, name)
+                    llm_cache_evict(key)
+
+            result = await node_func(**kwargs)
+            value = result.model_dump_json() if isinstance(result, BaseModel) else result
+            # An empty response would otherwise be replayed on every later run
+            if value and value.strip():
+                llm_cache_set(key, value, model)
+            else:
+                logger.warning("Not caching empty response from {}", name)
+            return result
+
+        Nodes.NODE_REGISTRY[name] = (wrapped_func, inputs + ["use_cache"], output)
+        return wrapped_func
+    return decorator
+
 # New Node: Check File Type
 @Nodes.define(output="file_type")
 async def check_file_type(file_path: str) -> str:
     """Determine the file type based on its extension."""
-    file_path = os.path.expanduser(file_path)
     if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
+        logger.error("File not found: {}", file_path)
         raise ValueError(f"File not found: {file_path}")
     ext = Path(file_path).suffix.lower()
     if ext == ".pdf":
@@ -69,7 +276,7 @@ async def check_file_type(file_path: str) -> str:
     elif ext == ".md":
         return "markdown"
     else:
-        logger.error(f"Unsupported file type: {ext}")
+        logger.error("Unsupported file type: {}", ext)
         raise ValueError(f"Unsupported file type: {ext}")
 
 # New Node: Read Text or Markdown File
@@ -77,40 +284,61 @@ async def check_file_type(file_path: str) -> str:
 async def read_text_or_markdown(file_path: str, file_type: str) -> str:
     """Read content from a text or markdown file."""
     if file_type not in ["text", "markdown"]:
-        logger.error(f"Node 'read_text_or_markdown' called with invalid file_type: {file_type}")
+        logger.error("Node 'read_text_or_markdown' called with invalid file_type: {}", file_type)
         raise ValueError(f"Expected 'text' or 'markdown', got {file_type}")
     try:
-        file_path = os.path.expanduser(file_path)
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-        logger.info(f"Read {file_type} content from {file_path}, length: {len(content)} characters")
+        async with aiofiles.open(file_path, encoding="utf-8") as f:
+            content = await f.read()
+        logger.debug("Read {} content from {}, length: {} characters", file_type, file_path, len(content))
         return content
     except Exception as e:
-        logger.error(f"Error reading {file_type} file {file_path}: {e}")
+        logger.error("Error reading {} file {}: {}", file_type, file_path, e)
         raise
 
+def render_pdf_pages(doc: pymupdf.Document, page_numbers: List[int]) -> List[str]:
+    """Rasterize 1-indexed PDF pages to base64-encoded PNGs."""
+    images = []
+    for page_number in page_numbers:
+        pixmap = doc.load_page(page_number - 1).get_pixmap(dpi=PDF_RENDER_DPI)
+        images.append(base64.b64encode(pixmap.tobytes("png")).decode("ascii"))
+    return images
+
+async def convert_page_to_markdown(model: str, system_prompt: str, image_b64: str) -> str:
+    """Transcribe a single rendered PDF page to Markdown with a vision model."""
+    response = await acompletion(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image_b64}"}}
+                ]
+            }
+        ]
+    )
+    content = response.choices[0].message.content or ""
+    fenced = _RE_MD_FENCE.match(content)
+    return fenced.group(1) if fenced else content.strip()
+
 # Node 1: Convert PDF to Markdown
-@Nodes.define(output="markdown_content")
+@Nodes.define()
 async def convert_pdf_to_markdown(
     file_path: str,
     model: str,
     custom_system_prompt: Optional[str] = None,
-    output_dir: Optional[str] = None,
     select_pages: Optional[Union[int, List[int]]] = None
-) -> str:
-    """Convert a PDF to Markdown using a vision model."""
-    file_path = os.path.expanduser(file_path)
-    if output_dir:
-        output_dir = os.path.expanduser(output_dir)
-        
+) -> dict:
+    """Convert a PDF to Markdown using a vision model.
+
+    Pages that fail to convert are skipped and listed in `failed_pages`;
+    a RuntimeError is raised if no page converts at all.
+    """
     if not file_path:
         logger.error("File path is required")
         raise ValueError("File path is required")
-    if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
-        raise ValueError(f"File not found: {file_path}")
     if not file_path.lower().endswith(".pdf"):
-        logger.error(f"File must be a PDF: {file_path}")
+        logger.error("File must be a PDF: {}", file_path)
         raise ValueError(f"File must be a PDF: {file_path}")
 
     if custom_system_prompt is None:
@@ -122,54 +350,71 @@ async def convert_pdf_to_markdown(
         )
 
     try:
-        logger.info(f"Calling zerox with model: {model}, file: {file_path}")
-        zerox_result = await zerox(
-            file_path=file_path,
-            model=model,
-            system_prompt=custom_system_prompt,
-            output_dir=output_dir,
-            select_pages=select_pages
-        )
-
-        markdown_content = ""
-        if hasattr(zerox_result, 'pages') and zerox_result.pages:
-            markdown_content = "\n\n".join(
-                page.content for page in zerox_result.pages
-                if hasattr(page, 'content') and page.content
-            )
-        elif isinstance(zerox_result, str):
-            markdown_content = zerox_result
-        elif hasattr(zerox_result, 'markdown'):
-            markdown_content = zerox_result.markdown
-        elif hasattr(zerox_result, 'text'):
-            markdown_content = zerox_result.text
-        else:
-            markdown_content = str(zerox_result)
-            logger.warning("Unexpected zerox_result type; converted to string.")
-
+        logger.info("Converting PDF with model: {}, file: {}", model, file_path)
+        buffer = io.StringIO()
+        failed_pages = []
+        last_error = None
+        with pymupdf.open(file_path) as doc:
+            if select_pages is None:
+                page_numbers = range(1, doc.page_count + 1)
+            elif isinstance(select_pages, int):
+                page_numbers = [select_pages]
+            else:
+                page_numbers = select_pages
+
+            page_numbers = list(page_numbers)
+            for start in range(0, len(page_numbers), PDF_PAGE_BATCH_SIZE):
+                batch = page_numbers[start:start + PDF_PAGE_BATCH_SIZE]
+                # Rendering is CPU-bound; keep it off the event loop
+                images = await asyncio.to_thread(render_pdf_pages, doc, batch)
+                results = await asyncio.gather(
+                    *(convert_page_to_markdown(model, custom_system_prompt, image_b64) for image_b64 in images),
+                    return_exceptions=True
+                )
+                for page_number, content in zip(batch, results):
+                    if isinstance(content, Exception):
+                        logger.warning("Failed to convert page {}: {}", page_number, content)
+                        failed_pages.append(page_number)
+                        last_error = content
+                        continue
+                    if not content:
+                        continue
+                    if buffer.tell():
+                        buffer.write("\n\n")
+                    buffer.write(content)
+        if page_numbers and len(failed_pages) == len(page_numbers):
+            raise RuntimeError(f"All {len(page_numbers)} pages failed to convert; last error: {last_error}")
+        if failed_pages:
+            logger.warning("{} of {} pages failed to convert: {}", len(failed_pages), len(page_numbers), failed_pages)
+
+        markdown_content = buffer.getvalue()
         if not markdown_content.strip():
             logger.warning("Generated Markdown content is empty.")
-            return ""
-
-        logger.info(f"Extracted Markdown content length: {len(markdown_content)} characters")
-        return markdown_content
+            markdown_content = ""
+        else:
+            logger.info("Extracted Markdown content length: {} characters", len(markdown_content))
+        return {"markdown_content": markdown_content, "failed_pages": failed_pages}
     except Exception as e:
-        logger.error(f"Error converting PDF to Markdown: {e}")
+        logger.error("Error converting PDF to Markdown: {}", e)
         raise
 
+async def write_text_chunks(output_path: Path, text: str) -> None:
+    """Write text in WRITE_CHUNK_SIZE slices so only one slice is encoded at a time."""
+    async with aiofiles.open(output_path, "w", encoding="utf-8") as f:
+        for start in range(0, len(text), WRITE_CHUNK_SIZE):
+            await f.write(text[start:start + WRITE_CHUNK_SIZE])
+
 # Node: Save Markdown Content
 @Nodes.define(output="markdown_file_path")
-async def save_markdown_content(markdown_content: str, file_path: str) -> str:
+async def save_markdown_content(markdown_content: str, file_path: str, output_dir: str) -> str:
     """Save the extracted markdown content to a file."""
     try:
-        file_path_expanded = os.path.expanduser(file_path)
-        output_path = Path(file_path_expanded).with_suffix(".extracted.md")
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        logger.info(f"Saved extracted markdown content to: {output_path}")
+        output_path = Path(output_dir) / Path(file_path).with_suffix(".extracted.md").name
+        await write_text_chunks(output_path, markdown_content)
+        logger.info("Saved extracted markdown content to: {}", output_path)
         return str(output_path)
     except Exception as e:
-        logger.error(f"Error saving markdown content: {e}")
+        logger.error("Error saving markdown content: {}", e)
         raise
 
 # Node: Extract First 100 Lines
@@ -177,16 +422,31 @@ async def save_markdown_content(markdown_content: str, file_path: str) -> str:
 async def extract_first_100_lines(markdown_content: str) -> str:
     """Extract the first 100 lines from the Markdown content."""
     try:
-        lines = markdown_content.splitlines()
-        first_100 = lines[:100]
-        result = "\n".join(first_100)
-        logger.info(f"Extracted {len(first_100)} lines from Markdown content")
+        # Scan for the 100th newline instead of splitting the whole document
+        idx = -1
+        for _ in range(100):
+            nxt = markdown_content.find("\n", idx + 1)
+            if nxt == -1:
+                # Keep an unterminated last line; a trailing newline is dropped as splitlines() would
+                if idx + 1 < len(markdown_content):
+                    idx = len(markdown_content)
+                break
+            idx = nxt
+        result = markdown_content[:max(idx, 0)]
+        if "\r" in result:
+            # Match splitlines()/join output for CRLF input as well
+            result = result.replace("\r\n", "\n").removesuffix("\r")
+        logger.opt(lazy=True).debug(
+            "Extracted {} lines from Markdown content",
+            lambda: result.count("\n") + 1 if idx >= 0 else 0
+        )
         return result
     except Exception as e:
-        logger.error(f"Error extracting first 100 lines: {e}")
+        logger.error("Error extracting first 100 lines: {}", e)
         raise
 
 # Node: Extract Title and Authors using Structured LLM
+@cached_llm_node(response_model=PaperInfo)
 @Nodes.structured_llm_node(
     system_prompt="You are an AI assistant tasked with extracting the title and authors from a research paper's Markdown text.",
     output="paper_info",
@@ -204,10 +464,10 @@ async def extract_title_str(paper_info: PaperInfo) -> str:
     """Extract title string from PaperInfo object."""
     try:
         title_str = paper_info.title
-        logger.info(f"Extracted title: '{title_str}'")
+        logger.debug("Extracted title: '{}'", title_str)
         return title_str
     except Exception as e:
-        logger.error(f"Error extracting title: {e}")
+        logger.error("Error extracting title: {}", e)
         raise
 
 # Node: Extract Authors String
@@ -216,13 +476,14 @@ async def extract_authors_str(paper_info: PaperInfo) -> str:
     """Extract authors string from PaperInfo object."""
     try:
         authors_str = ", ".join(paper_info.authors)
-        logger.info(f"Extracted authors: '{authors_str}'")
+        logger.debug("Extracted authors: '{}'", authors_str)
         return authors_str
     except Exception as e:
-        logger.error(f"Error extracting authors: {e}")
+        logger.error("Error extracting authors: {}", e)
         raise
 
 # Node: Generate LinkedIn Post using LLM
+@cached_llm_node()
 @Nodes.llm_node(
     system_prompt="You are an AI expert who enjoys sharing interesting papers and articles with a professional audience.",
     output="draft_post_content",
@@ -261,20 +522,19 @@ async def generate_linkedin_post(title_str: str, authors_str: str, markdown_cont
 
 # Node: Save Draft LinkedIn Post
 @Nodes.define(output="draft_post_file_path")
-async def save_draft_post_content(draft_post_content: str, file_path: str) -> str:
+async def save_draft_post_content(draft_post_content: str, file_path: str, output_dir: str) -> str:
     """Save the draft LinkedIn post content to a markdown file."""
     try:
-        file_path_expanded = os.path.expanduser(file_path)
-        output_path = Path(file_path_expanded).with_suffix(".draft.md")
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write(draft_post_content)
-        logger.info(f"Saved draft LinkedIn post to: {output_path}")
+        output_path = Path(output_dir) / Path(file_path).with_suffix(".draft.md").name
+        await write_text_chunks(output_path, draft_post_content)
+        logger.info("Saved draft LinkedIn post to: {}", output_path)
         return str(output_path)
     except Exception as e:
-        logger.error(f"Error saving draft post content: {e}")
+        logger.error("Error saving draft post content: {}", e)
         raise
 
 # Node: Format LinkedIn Post for publishing
+@cached_llm_node()
 @Nodes.llm_node(
     system_prompt="You are an expert LinkedIn post formatter who prepares content for direct publishing.",
     output="post_content",
@@ -298,36 +558,51 @@ async def format_linkedin_post(draft_post_content: str) -> str:
     """Clean and format the LinkedIn post for publishing."""
     pass
 
+# Node: Save Markdown while Extracting Title and Authors
+@Nodes.define()
+async def save_markdown_and_extract_paper_info(
+    markdown_content: str,
+    file_path: str,
+    output_dir: str,
+    first_100_lines: str,
+    model: str,
+    use_cache: bool
+) -> dict:
+    """Save the extracted markdown concurrently with the title/author LLM call."""
+    markdown_file_path, paper_info = await asyncio.gather(
+        save_markdown_content(markdown_content=markdown_content, file_path=file_path, output_dir=output_dir),
+        extract_paper_info(model=model, first_100_lines=first_100_lines, use_cache=use_cache)
+    )
+    return {"markdown_file_path": markdown_file_path, "paper_info": paper_info}
+
+# Node: Save Draft while Formatting LinkedIn Post
+@Nodes.define()
+async def save_draft_and_format_post(
+    draft_post_content: str,
+    file_path: str,
+    output_dir: str,
+    model: str,
+    use_cache: bool
+) -> dict:
+    """Save the draft post concurrently with the formatting LLM call."""
+    draft_post_file_path, post_content = await asyncio.gather(
+        save_draft_post_content(draft_post_content=draft_post_content, file_path=file_path, output_dir=output_dir),
+        format_linkedin_post(model=model, draft_post_content=draft_post_content, use_cache=use_cache)
+    )
+    return {"draft_post_file_path": draft_post_file_path, "post_content": post_content}
+
 # Node: Clean Markdown Syntax with Regex
 @Nodes.define(output="cleaned_post_content")
 async def clean_markdown_syntax(post_content: str) -> str:
     """Clean any remaining markdown syntax from the post content using regex."""
-    import re
     try:
-        # Remove bold syntax
-        cleaned = re.sub(r'\*\*(.*?)\*\*', r'\1', post_content)
-        # Remove italic syntax (both * and _)
-        cleaned = re.sub(r'\*(.*?)\*', r'\1', cleaned)
-        cleaned = re.sub(r'_(.*?)_', r'\1', cleaned)
-        # Remove header syntax
-        cleaned = re.sub(r'^#+\s+', '', cleaned, flags=re.MULTILINE)
-        # Remove horizontal rules
-        cleaned = re.sub(r'^\s*[-*_]{3,}\s*$', '\n', cleaned, flags=re.MULTILINE)
-        # Remove code blocks
-        cleaned = re.sub(r'```[^\n]*\n(.*?)\n```', r'\1', cleaned, flags=re.DOTALL)
-        # Remove inline code
-        cleaned = re.sub(r'`([^`]*)`', r'\1', cleaned)
-        # Remove blockquotes
-        cleaned = re.sub(r'^>\s+', '', cleaned, flags=re.MULTILINE)
-        # Remove link syntax but keep text
-        cleaned = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', cleaned)
-        # Remove HTML tags
-        cleaned = re.sub(r'<[^>]+>', '', cleaned)
+        # Strip bold/italic, headers, rules, code, blockquotes, links and HTML in one scan
+        cleaned = _MD_CLEAN.sub(_md_clean_sub, post_content)
         
-        logger.info("Successfully cleaned Markdown syntax from post content")
+        logger.debug("Successfully cleaned Markdown syntax from post content")
         return cleaned.strip()
     except Exception as e:
-        logger.error(f"Error cleaning Markdown syntax: {e}")
+        logger.error("Error cleaning Markdown syntax: {}", e)
         # Return original content if there's an error
         return post_content
 
@@ -341,10 +616,10 @@ async def copy_to_clipboard(post_content: str, do_copy: bool) -> str:
             logger.info("Copied LinkedIn post content to clipboard")
             return "Content copied to clipboard"
         except Exception as e:
-            logger.error(f"Error copying to clipboard: {e}")
+            logger.error("Error copying to clipboard: {}", e)
             raise
     else:
-        logger.info("Clipboard copying skipped as per user preference")
+        logger.debug("Clipboard copying skipped as per user preference")
         return "Clipboard copying skipped"
 
 # Define the Updated Workflow with Model Fix and Loop Prevention
@@ -356,14 +631,12 @@ def create_file_to_linkedin_workflow() -> Workflow:
     wf.node("check_file_type")
     wf.node("convert_pdf_to_markdown", inputs_mapping={"model": "text_extraction_model"})
     wf.node("read_text_or_markdown")
-    wf.node("save_markdown_content")
     wf.node("extract_first_100_lines")
-    wf.node("extract_paper_info", inputs_mapping={"model": "cleaning_model"})
+    wf.node("save_markdown_and_extract_paper_info", inputs_mapping={"model": "cleaning_model"})
     wf.node("extract_title_str")
     wf.node("extract_authors_str")
     wf.node("generate_linkedin_post", inputs_mapping={"model": "writing_model"})
-    wf.node("save_draft_post_content")
-    wf.node("format_linkedin_post", inputs_mapping={"model": "cleaning_model"})
+    wf.node("save_draft_and_format_post", inputs_mapping={"model": "cleaning_model"})
     wf.node("clean_markdown_syntax")  # Add the new node to the workflow
     wf.node("copy_to_clipboard")
     
@@ -375,18 +648,16 @@ def create_file_to_linkedin_workflow() -> Workflow:
     ])
     
     # Explicitly set transitions from branches to convergence point
-    wf.transitions["convert_pdf_to_markdown"] = [("save_markdown_content", None)]
-    wf.transitions["read_text_or_markdown"] = [("save_markdown_content", None)]
+    wf.transitions["convert_pdf_to_markdown"] = [("extract_first_100_lines", None)]
+    wf.transitions["read_text_or_markdown"] = [("extract_first_100_lines", None)]
     
     # Define linear sequence after convergence without re-converging
-    wf.transitions["save_markdown_content"] = [("extract_first_100_lines", None)]
-    wf.transitions["extract_first_100_lines"] = [("extract_paper_info", None)]
-    wf.transitions["extract_paper_info"] = [("extract_title_str", None)]
+    wf.transitions["extract_first_100_lines"] = [("save_markdown_and_extract_paper_info", None)]
+    wf.transitions["save_markdown_and_extract_paper_info"] = [("extract_title_str", None)]
     wf.transitions["extract_title_str"] = [("extract_authors_str", None)]
     wf.transitions["extract_authors_str"] = [("generate_linkedin_post", None)]
-    wf.transitions["generate_linkedin_post"] = [("save_draft_post_content", None)]
-    wf.transitions["save_draft_post_content"] = [("format_linkedin_post", None)]
-    wf.transitions["format_linkedin_post"] = [("clean_markdown_syntax", None)]  # Add transition to new node
+    wf.transitions["generate_linkedin_post"] = [("save_draft_and_format_post", None)]
+    wf.transitions["save_draft_and_format_post"] = [("clean_markdown_syntax", None)]  # Add transition to new node
     wf.transitions["clean_markdown_syntax"] = [("copy_to_clipboard", None)]  # Add transition from new node
     
     return wf
@@ -399,16 +670,15 @@ async def run_workflow(
     writing_model: str,
     output_dir: Optional[str] = None,
     copy_to_clipboard_flag: bool = True,
-    max_character_count: int = 3000
+    max_character_count: int = 3000,
+    use_cache: bool = True
 ) -> dict:
-    """Execute the workflow with the given file path and models."""
-    file_path = os.path.expanduser(file_path)
+    """Execute the workflow with the given file path and models.
+
+    file_path and output_dir are expected to be already expanded and resolved.
+    """
     if output_dir:
-        output_dir = os.path.expanduser(output_dir)
-        
-    if not os.path.exists(file_path):
-        logger.error(f"File not found: {file_path}")
-        raise ValueError(f"File not found: {file_path}")
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
 
     # Initial context with model keys for dynamic mapping
     initial_context = {
@@ -419,10 +689,30 @@ async def run_workflow(
         "writing_model": writing_model,
         "output_dir": output_dir if output_dir else str(Path(file_path).parent),
         "do_copy": copy_to_clipboard_flag,
-        "max_character_count": max_character_count
+        "max_character_count": max_character_count,
+        "use_cache": use_cache
     }
 
     try:
+        final_cache_key = None
+        if use_cache and os.path.isfile(file_path):
+            file_hash = await asyncio.to_thread(file_sha256, file_path)
+            final_cache_key = file_hash + "|" + ":".join([
+                file_path,
+                text_extraction_model,
+                cleaning_model,
+                writing_model,
+                str(max_character_count),
+                PROMPT_VERSION,
+                initial_context["output_dir"]
+            ])
+            cached = final_cache_get(final_cache_key)
+            if cached is not None:
+                logger.info("Reusing cached LinkedIn post for {}", file_path)
+                if copy_to_clipboard_flag:
+                    pyperclip.copy(cached["post_content"])
+                return cached
+
         workflow = create_file_to_linkedin_workflow()
         engine = workflow.build()
         result = await engine.run(initial_context)
@@ -431,25 +721,23 @@ async def run_workflow(
             logger.warning("No LinkedIn post content generated.")
             raise ValueError("Workflow completed but no post content was generated.")
         
+        # Never cache a post built from an incomplete or empty document
+        if result.get("failed_pages"):
+            logger.warning("Not caching final post: pages {} failed to convert", result["failed_pages"])
+        elif final_cache_key is not None and result.get("markdown_content", "").strip():
+            final_cache_set(final_cache_key, result)
         logger.info("Workflow completed successfully")
         return result
     except Exception as e:
-        logger.error(f"Error during workflow execution: {e}")
+        logger.error("Error during workflow execution: {}", e)
         raise
 
 async def display_results(post_content: str, markdown_file_path: str, draft_post_file_path: str, copy_to_clipboard_flag: bool):
-    """Async helper function to display results with animation."""
+    """Async helper function to display results."""
     console.print("\n[bold green]Generated LinkedIn Post:[/]")
     console.print(Panel(Markdown(post_content), border_style="blue"))
     
     if copy_to_clipboard_flag:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True
-        ) as progress:
-            progress.add_task("[cyan]Copying to clipboard...", total=None)
-            await asyncio.sleep(1)  # Simulate some processing time for effect
         console.print("[green]✓ Content copied to clipboard![/]")
     else:
         console.print("[yellow]Clipboard copying skipped as per user preference[/]")
@@ -466,38 +754,54 @@ def analyze(
     output_dir: Annotated[Optional[str], typer.Option(help="Directory to save output files (supports ~ expansion)")] = None,
     save: Annotated[bool, typer.Option(help="Save output to a markdown file")] = True,
     copy_to_clipboard_flag: Annotated[bool, typer.Option(help="Copy the final post to clipboard")] = True,
-    max_character_count: Annotated[int, typer.Option(help="Maximum character count for the LinkedIn post")] = 3000
+    max_character_count: Annotated[int, typer.Option(help="Maximum character count for the LinkedIn post")] = 3000,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Bypass the on-disk LLM output and final post caches")] = False,
+    verbose: Annotated[bool, typer.Option("--verbose", help="Show progress logs (INFO level); LOG_LEVEL sets the default")] = False
 ):
     """Convert a file (PDF, text, or Markdown) to a LinkedIn post using an LLM workflow."""
-    try:
+    if verbose:
+        logger.remove()
+        logger.add(sys.stderr, level="INFO")
+
+    # Resolve paths once; workflow nodes use them as-is
+    resolved_file_path = Path(file_path).expanduser().resolve()
+    resolved_output_dir = str(Path(output_dir).expanduser().resolve()) if output_dir else None
+
+    async def _main() -> dict:
+        # Run the workflow and display in one event loop
         with console.status(f"Processing [bold blue]{file_path}[/]..."):
-            result = asyncio.run(run_workflow(
-                file_path,
+            result = await run_workflow(
+                str(resolved_file_path),
                 text_extraction_model,
                 cleaning_model,
                 writing_model,
-                output_dir,
+                resolved_output_dir,
                 copy_to_clipboard_flag,
-                max_character_count
-            ))
-        
+                max_character_count,
+                not no_cache
+            )
+        await display_results(
+            result["post_content"],
+            result.get("markdown_file_path", "Not saved"),
+            result.get("draft_post_file_path", "Not saved"),
+            copy_to_clipboard_flag
+        )
+        return result
+
+    try:
+        result = asyncio.run(_main())
         post_content = result["post_content"]
-        markdown_file_path = result.get("markdown_file_path", "Not saved")
-        draft_post_file_path = result.get("draft_post_file_path", "Not saved")
-        
-        # Run the async display function
-        asyncio.run(display_results(post_content, markdown_file_path, draft_post_file_path, copy_to_clipboard_flag))
         
         if save:
-            file_path_expanded = os.path.expanduser(file_path)
-            output_path = Path(file_path_expanded).with_suffix(".md")
+            # Same directory as the extracted markdown and draft files
+            output_path = Path(resolved_output_dir or resolved_file_path.parent) / resolved_file_path.with_suffix(".md").name
             with output_path.open("w", encoding="utf-8") as f:
                 f.write(post_content)
             console.print(f"[green]✓ Final LinkedIn post saved to:[/] {output_path}")
-            logger.info(f"Saved LinkedIn post to: {output_path}")
+            logger.info("Saved LinkedIn post to: {}", output_path)
     
     except Exception as e:
-        logger.error(f"Failed to run workflow: {e}")
+        logger.error("Failed to run workflow: {}", e)
         console.print(f"[bold red]Error:[/] {str(e)}")
         raise typer.Exit(code=1)
 
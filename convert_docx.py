@@ -12,50 +12,53 @@
 # ]
 # ///
 
+import asyncio
+import os
 import subprocess
 import pathlib
 import sys
-from typing import Optional, List, Union
+import tempfile
+from typing import Iterable, Optional, List, Tuple, Union
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
 
 console = Console()
 
-def markdown_to_docx(
+# Pandoc flags shared by every conversion; input/output and options are appended per call
+_PANDOC_BASE = (
+    "pandoc",
+    "-s",
+    "--mathml",
+    "--columns=80",
+    "--toc",
+    "--metadata", "title=Document",
+    "-f", "markdown+emoji+smart",
+)
+
+async def markdown_to_docx_async(
     input_md: Union[str, pathlib.Path],
     output_docx: Union[str, pathlib.Path],
     reference_doc: Optional[Union[str, pathlib.Path]] = None,
     resource_dir: Optional[Union[str, pathlib.Path]] = None
 ) -> None:
     """
-    Convert Markdown to DOCX with Pandoc using advanced formatting options
+    Convert Markdown to DOCX with Pandoc without blocking the event loop
 
-    This function leverages Pandoc to provide precise control over the conversion process,
-    ensuring consistent formatting and proper handling of special elements like math equations.
-    The use of a reference DOCX template allows for maintaining brand-consistent styling,
-    while the resource directory ensures all images and assets are correctly embedded.
+    Runs the same Pandoc command as markdown_to_docx as an asyncio subprocess, so
+    several conversions can run side by side (see batch_markdown_to_docx).
 
     Args:
         input_md: Path to input Markdown file
         output_docx: Path for output DOCX file
         reference_doc: Path to reference template DOCX (optional)
         resource_dir: Resource path for images/assets (optional)
+
+    Raises:
+        subprocess.CalledProcessError: If Pandoc exits with a non-zero status
+        FileNotFoundError: If Pandoc is not installed
     """
-    input_md = str(input_md)
-    output_docx = str(output_docx)
-    
-    cmd = [
-        "pandoc",
-        "-s",
-        "--mathml",
-        "--columns=80",
-        "--toc",
-        "--metadata", "title=Document",
-        "-f", "markdown+emoji+smart",
-        input_md,
-        "-o", output_docx
-    ]
+    cmd = [*_PANDOC_BASE, str(input_md), "-o", str(output_docx)]
     
     if reference_doc:
         cmd.extend(["--reference-doc", str(reference_doc)])
@@ -63,15 +66,71 @@ def markdown_to_docx(
     if resource_dir:
         cmd.extend(["--resource-path", str(resource_dir)])
     
-    try:
-        with console.status("Converting Markdown to DOCX...", spinner='dots'):
-            result = subprocess.run(
+    # pandoc writes the DOCX itself; stderr goes to a temp file and is read only on failure
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=stderr_file
+        )
+        returncode = await proc.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode,
                 cmd,
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stderr=stderr_file.read().decode(errors="replace")
             )
+
+async def batch_markdown_to_docx(
+    jobs: Iterable[Tuple[Union[str, pathlib.Path], Union[str, pathlib.Path]]],
+    reference_doc: Optional[Union[str, pathlib.Path]] = None,
+    resource_dir: Optional[Union[str, pathlib.Path]] = None,
+    max_concurrency: Optional[int] = None
+) -> None:
+    """
+    Convert several Markdown files to DOCX in parallel
+
+    Pandoc is CPU-bound, so at most max_concurrency processes (default: one per
+    CPU core) run at the same time.
+
+    Args:
+        jobs: (input_md, output_docx) pairs
+        reference_doc: Path to reference template DOCX applied to every file (optional)
+        resource_dir: Resource path for images/assets (optional)
+        max_concurrency: Maximum number of Pandoc processes running at once (optional)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+
+    async def convert_one(input_md, output_docx):
+        async with semaphore:
+            await markdown_to_docx_async(input_md, output_docx, reference_doc, resource_dir)
+
+    await asyncio.gather(*[convert_one(input_md, output_docx) for input_md, output_docx in jobs])
+
+def markdown_to_docx(
+    input_md: Union[str, pathlib.Path],
+    output_docx: Union[str, pathlib.Path],
+    reference_doc: Optional[Union[str, pathlib.Path]] = None,
+    resource_dir: Optional[Union[str, pathlib.Path]] = None
+) -> None:
+    """
+    Convert Markdown to DOCX with Pandoc using advanced formatting options
+
+    This function leverages Pandoc to provide precise control over the conversion process,
+    ensuring consistent formatting and proper handling of special elements like math equations.
+    The use of a reference DOCX template allows for maintaining brand-consistent styling,
+    while the resource directory ensures all images and assets are correctly embedded.
+
+    Args:
+        input_md: Path to input Markdown file
+        output_docx: Path for output DOCX file
+        reference_doc: Path to reference template DOCX (optional)
+        resource_dir: Resource path for images/assets (optional)
+    """
+    try:
+        with console.status("Converting Markdown to DOCX...", spinner='dots'):
+            asyncio.run(markdown_to_docx_async(input_md, output_docx, reference_doc, resource_dir))
         
         console.print(
             Panel(
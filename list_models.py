@@ -3,80 +3,138 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "litellm>=1.59.8",
-#     "loguru",
-#     "pydantic>=2.0.0",
-#     "python-dotenv",
+#     "httpx[http2]>=0.27",
 #     "rich",
-#     "typing",
-#     "argparse",
+#     "rapidfuzz>=3.0",
+#     "orjson>=3.9",
 # ]
 # ///
 
+from __future__ import annotations
+
 import os
+import sys
 import argparse
-import requests
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.markup import escape
-from typing import Dict, List, Optional
+import functools
+import time
+import orjson
+from rapidfuzz import fuzz, process
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+# Rich and httpx (whose CLI module imports Rich) are imported lazily inside the
+# functions so --help, early errors and disk-cache hits skip them
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Minimum partial_ratio score (0-100) for a fuzzy match
+FUZZY_SCORE_CUTOFF = 70
+
+# Shared read-only fallback for missing nested dicts (provider, pricing)
+_EMPTY: Dict = {}
+
+MODELS_URL = "https://openrouter.ai/api/v1/models"
+# The catalog is cached on disk and refetched once the file is older than the TTL
+CACHE_DIR = Path("~/.cache/openrouter-tool").expanduser()
+MODELS_CACHE_PATH = CACHE_DIR / "models.json"
+MODELS_CACHE_TTL = 600  # seconds
+
+class FetchError(Exception):
+    """Raised when the model catalog cannot be downloaded."""
+
+@functools.lru_cache(maxsize=256, typed=True)
+def _fmt_price(value) -> str:
+    """Format a per-million-token price; many models share identical prices."""
+    return f"${value:.6g}/1M" if isinstance(value, float) else "N/A"
+
+def _shorten(text: str, width: int = 40) -> str:
+    """Collapse whitespace and cut to width characters, ending with an ellipsis if cut."""
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[:width - 1] + "…"
 
 def normalize_search_text(text: str) -> str:
     """Normalize text for fuzzy matching by removing special characters and lowercase."""
     return ''.join([c.lower() for c in text if c.isalnum() or c.isspace()]).strip()
 
+def build_search_blob(model: Dict[str, str]) -> bytes:
+    """Join the searchable fields of a model into one lowercase UTF-8 blob."""
+    return "\n".join((
+        model.get("id") or "",
+        model.get("name") or "",
+        (model.get("provider") or {}).get("id") or "",
+        model.get("description") or ""
+    )).lower().encode("utf-8")
+
 def list_models(models_data: Dict[str, List[Dict[str, str]]], 
                console: Console, 
                search_filter: Optional[str] = None) -> None:
     """Display models with enhanced fuzzy search functionality."""
+    from rich.markup import escape
+    from rich.panel import Panel
+    from rich.table import Table
+
     all_models = models_data.get("data", [])
     filtered_models = all_models
 
     if search_filter:
-        # Convert search filter to lowercase for case-insensitive substring match
-        normalized_filter = search_filter.lower()
+        # Convert search filter to lowercase UTF-8 for case-insensitive substring match
+        needle = search_filter.lower().encode("utf-8")
+        
+        # Lowercase ID, name, provider and description once per model and keep the result
+        for model in all_models:
+            if "_search_blob" not in model:
+                model["_search_blob"] = build_search_blob(model)
         
         # Filter models based on substring match in ID, name, provider, or description
         filtered_models = [
-            model for model in all_models 
-            if (
-                normalized_filter in model.get('id', '').lower() or
-                normalized_filter in model.get('name', '').lower() or
-                normalized_filter in model.get('provider', {}).get('id', '').lower() or
-                normalized_filter in model.get('description', '').lower()
-            )
+            model for model in all_models
+            if needle in model["_search_blob"]
         ]
 
+        # No substring hit: fall back to typo-tolerant matching, best matches first
+        if not filtered_models:
+            matches = process.extract(
+                needle,
+                [model["_search_blob"] for model in all_models],
+                scorer=fuzz.partial_ratio,
+                score_cutoff=FUZZY_SCORE_CUTOFF,
+                limit=None
+            )
+            filtered_models = [all_models[index] for _, _, index in matches]
+
     # Build table with original styling
     table = Table(
         show_header=True,
         header_style="bold magenta",
-        expand=True,
+        expand=False,
         box=None,
         show_edge=False
     )
-    table.add_column("Model ID", style="cyan", no_wrap=True)
+    table.add_column("Model ID", style="cyan")
     table.add_column("Context Window", justify="right")
     table.add_column("Provider", style="green")
     table.add_column("Input Pricing", justify="right")
     table.add_column("Output Pricing", justify="right")
     table.add_column("Description", style="yellow", width=40)
 
-    for model in filtered_models:
-        pricing = model.get("pricing", {})
-        input_cost = pricing.get("prompt", "N/A")
-        output_cost = pricing.get("completion", "N/A")
-
-        table.add_row(
+    def _row(model: Dict[str, str]) -> tuple:
+        """Build the display cells for one model."""
+        provider = model.get("provider") or _EMPTY
+        pricing = model.get("pricing") or _EMPTY
+        return (
             escape(model.get("id", "N/A")),
             f"{model.get('context_length', 'N/A'):,} tokens",
-            escape(model.get("provider", {}).get("id", "N/A")),
-            f"${input_cost}/1M" if isinstance(input_cost, float) else "N/A",
-            f"${output_cost}/1M" if isinstance(output_cost, float) else "N/A",
-            escape(model.get("description", "No description available"))
+            escape(provider.get("id", "N/A")),
+            _fmt_price(pricing.get("prompt")),
+            _fmt_price(pricing.get("completion")),
+            escape(_shorten(model.get("description") or "No description available"))
         )
 
+    # Build every row's cells up front, then feed them to Rich in a tight loop
+    rows = [_row(model) for model in filtered_models]
+    for row in rows:
+        table.add_row(*row)
+
     # Build subtitle with filtering info
     subtitle_parts = [
         f"Showing {len(filtered_models)} of {len(all_models)} models",
@@ -95,6 +153,9 @@ def list_models(models_data: Dict[str, List[Dict[str, str]]],
 
 def show_model_details(model_data: Dict[str, str], console: Console) -> None:
     """Display detailed model information with original formatting."""
+    from rich.markup import escape
+    from rich.panel import Panel
+
     details = [
         f"[bold]Name:[/bold] {escape(model_data.get('name', 'N/A'))}",
         f"[bold]Description:[/bold] {escape(model_data.get('description', 'No description'))}",
@@ -116,6 +177,36 @@ def show_model_details(model_data: Dict[str, str], console: Console) -> None:
         )
     )
 
+def index_models(models_data: Dict[str, List[Dict[str, str]]]) -> Dict[str, List[Dict[str, str]]]:
+    """Attach an id -> model index to the catalog as ``_by_id``."""
+    models_data["_by_id"] = {m["id"]: m for m in models_data.get("data", [])}
+    return models_data
+
+def fetch_models(headers: Dict[str, str]) -> Dict[str, List[Dict[str, str]]]:
+    """Return the indexed OpenRouter model catalog, from the disk cache while it is fresh."""
+    try:
+        if time.time() - MODELS_CACHE_PATH.stat().st_mtime < MODELS_CACHE_TTL:
+            return index_models(orjson.loads(MODELS_CACHE_PATH.read_bytes()))
+    except (OSError, orjson.JSONDecodeError):
+        pass  # Missing, unreadable or corrupt cache: refetch
+
+    import httpx
+
+    # HTTP/2 client; httpx advertises gzip in Accept-Encoding, so the large JSON body arrives compressed
+    try:
+        with httpx.Client(http2=True, timeout=10.0) as client:
+            response = client.get(MODELS_URL, headers=headers)
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise FetchError(str(e)) from e
+    models_data = orjson.loads(response.content)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        MODELS_CACHE_PATH.write_bytes(response.content)
+    except OSError:
+        pass  # Caching is best effort
+    return index_models(models_data)
+
 def main() -> None:
     """Main CLI execution flow with error handling."""
     parser = argparse.ArgumentParser(
@@ -142,6 +233,9 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    from rich.console import Console
+    from rich.markup import escape
+
     # API request configuration
     headers = {
         "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
@@ -150,29 +244,29 @@ def main() -> None:
     }
     
     try:
-        response = requests.get("https://openrouter.ai/api/v1/models", headers=headers)
-        response.raise_for_status()
-        models_data = response.json()
-    except requests.RequestException as e:
+        models_data = fetch_models(headers)
+    except (FetchError, orjson.JSONDecodeError) as e:
         Console().print(f"[bold red]Error:[/bold red] Failed to fetch models: {str(e)}")
         return
 
-    console = Console()
+    # Markup is explicit, so skip Rich's regex highlighter
+    console = Console(highlight=False, safe_box=True)
 
-    if args.command == 'list':
-        list_models(models_data, console, args.filter)
-    elif args.command == 'info':
-        model = next(
-            (m for m in models_data.get('data', []) if m['id'] == args.model_id),
-            None
-        )
-        if model:
-            show_model_details(model, console)
-        else:
-            console.print(
-                f"[bold red]Error:[/bold red] Model '{escape(args.model_id)}' not found. "
-                "Use 'list' command to see available models."
-            )
+    # Render everything into one buffer and write it to stdout in a single call
+    with console.capture() as capture:
+        if args.command == 'list':
+            list_models(models_data, console, args.filter)
+        elif args.command == 'info':
+            model = models_data['_by_id'].get(args.model_id)
+            if model:
+                show_model_details(model, console)
+            else:
+                console.print(
+                    f"[bold red]Error:[/bold red] Model '{escape(args.model_id)}' not found. "
+                    "Use 'list' command to see available models."
+                )
+    sys.stdout.write(capture.get())
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
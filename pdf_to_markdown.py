@@ -14,7 +14,8 @@
 #     "typer",
 #     "pathlib",
 #     "pathspec",
-#     "quantalogic"
+#     "quantalogic",
+#     "rich"
 # ]
 # ///
 
@@ -22,7 +23,9 @@
 # - poppler (for pdf2image): brew install poppler (macOS) or apt-get install poppler-utils (Linux)
 
 import asyncio
+import functools
 import os
+import sys
 import tempfile
 from pathlib import Path
 from typing import Optional, Union
@@ -30,6 +33,8 @@ from typing import Optional, Union
 import typer
 from loguru import logger
 from pyzerox import zerox
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
 
 # Import the flow API (assumes quantalogic/flow/flow.py is in your project structure)
 from quantalogic.flow.flow import Nodes, Workflow
@@ -48,16 +53,16 @@ def validate_pdf_path(pdf_path: str) -> bool:
         return False
     return True
 
-# Node to convert PDF to Markdown
-@Nodes.define(output="markdown_content")
+# Node to convert PDF to Markdown pages
+@Nodes.define(output="markdown_pages")
 async def convert_node(
     pdf_path: str,
     model: str,
     custom_system_prompt: Optional[str] = None,
     output_dir: Optional[str] = None,
     select_pages: Optional[Union[int, list[int]]] = None
-) -> str:
-    """Convert a PDF to Markdown using a vision model."""
+) -> list[str]:
+    """Convert a PDF to a list of Markdown pages using a vision model."""
     if not validate_pdf_path(pdf_path):
         raise ValueError("Invalid PDF path")
 
@@ -79,42 +84,50 @@ async def convert_node(
             select_pages=select_pages
         )
 
-        markdown_content = ""
-        if hasattr(zerox_result, 'pages') and zerox_result.pages:
-            markdown_content = "\n\n".join(
-                page.content for page in zerox_result.pages
-                if hasattr(page, 'content') and page.content
-            )
+        # Single getattr per shape instead of hasattr followed by attribute access
+        pages = getattr(zerox_result, 'pages', None)
+        if pages:
+            markdown_pages = [
+                content for content in (getattr(page, 'content', None) for page in pages)
+                if content
+            ]
         elif isinstance(zerox_result, str):
-            markdown_content = zerox_result
-        elif hasattr(zerox_result, 'markdown'):
-            markdown_content = zerox_result.markdown
-        elif hasattr(zerox_result, 'text'):
-            markdown_content = zerox_result.text
+            markdown_pages = [zerox_result]
         else:
-            markdown_content = str(zerox_result)
-            logger.warning("Unexpected zerox_result type; converted to string.")
+            content = getattr(zerox_result, 'markdown', None)
+            if content is None:
+                content = getattr(zerox_result, 'text', None)
+            if content is None:
+                content = str(zerox_result)
+                logger.warning("Unexpected zerox_result type; converted to string.")
+            markdown_pages = [content]
 
-        if not markdown_content.strip():
+        if not any(page.strip() for page in markdown_pages):
             logger.warning("Generated Markdown content is empty.")
-            return ""
+            return []
 
-        logger.info(f"Extracted Markdown content length: {len(markdown_content)} characters")
-        return markdown_content
+        logger.info(f"Extracted {len(markdown_pages)} Markdown pages, "
+                    f"{sum(map(len, markdown_pages))} characters")
+        return markdown_pages
 
     except Exception as e:
         logger.error(f"Error converting PDF to Markdown: {e}")
         raise
 
-# Node to save Markdown content to a file
+# Node to save Markdown pages to a file
 @Nodes.define(output="output_path")
-async def save_node(markdown_content: str, output_md: str) -> str:
-    """Save the Markdown content to the specified file path, overwriting if it exists."""
+async def save_node(markdown_pages: list[str], output_md: str) -> str:
+    """Write the Markdown pages to the specified file path one at a time, overwriting if it exists."""
     try:
         output_path = Path(output_md)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write(markdown_content)
+        # Pages are encoded and written as they come instead of joining them into one
+        # large string; binary mode skips the TextIOWrapper encoding layer
+        with output_path.open("wb", buffering=1 << 20) as f:
+            for i, page in enumerate(markdown_pages):
+                if i:
+                    f.write(b"\n\n")
+                f.write(page.encode("utf-8"))
         logger.info(f"Saved Markdown to: {output_path} (overwritten if existed)")
         return str(output_path)
     except Exception as e:
@@ -129,6 +142,11 @@ def create_pdf_to_md_workflow():
     )
     return workflow
 
+@functools.lru_cache(maxsize=1)
+def _get_workflow():
+    """Return the PDF-to-Markdown workflow, constructed once per process."""
+    return create_pdf_to_md_workflow()
+
 # Typer CLI app
 app = typer.Typer()
 
@@ -175,9 +193,8 @@ def convert(
     with tempfile.TemporaryDirectory() as temp_dir:
         initial_context["output_dir"] = temp_dir
         try:
-            # Build and run the workflow
-            workflow = create_pdf_to_md_workflow()
-            engine = workflow.build()
+            # Build an engine from the shared workflow and run it
+            engine = _get_workflow().build()
             result = asyncio.run(engine.run(initial_context))
 
             output_path = result.get("output_path")
@@ -190,5 +207,89 @@ def convert(
             typer.echo(f"Error during workflow execution: {e}", err=True)
             raise typer.Exit(code=1)
 
+async def convert_many(
+    pdf_paths: list[Path],
+    model: str,
+    system_prompt: Optional[str],
+    concurrency: int,
+    progress: Progress,
+) -> list[Union[str, BaseException]]:
+    """Convert several PDFs concurrently, running at most `concurrency` workflows at once."""
+    # Engines keep per-run state, so the workflow is shared but each file gets its own engine
+    workflow = _get_workflow()
+    sem = asyncio.Semaphore(concurrency)
+    task_id = progress.add_task("Converting", total=len(pdf_paths))
+
+    async def run_one(pdf_path: Path) -> str:
+        async with sem:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                try:
+                    result = await workflow.build().run({
+                        "pdf_path": str(pdf_path),
+                        "model": model,
+                        "custom_system_prompt": system_prompt,
+                        "output_md": str(pdf_path.with_suffix(".md")),
+                        "output_dir": temp_dir,
+                    })
+                finally:
+                    progress.advance(task_id)
+        output_path = result.get("output_path")
+        if not output_path:
+            raise RuntimeError("No output path generated")
+        return output_path
+
+    return await asyncio.gather(*(run_one(p) for p in pdf_paths), return_exceptions=True)
+
+@app.command()
+def batch(
+    input_dir: str = typer.Argument(..., help="Directory containing the PDF files to convert"),
+    pattern: str = typer.Option("*.pdf", help="Glob pattern used to select PDFs in input_dir"),
+    concurrency: int = typer.Option(4, min=1, help="Maximum number of PDFs converted at the same time"),
+    model: str = typer.Option("gemini/gemini-2.0-flash", help="LiteLLM-compatible model name (e.g., 'openai/gpt-4o-mini', 'gemini/gemini-2.0-flash')"),
+    system_prompt: Optional[str] = typer.Option(None, help="Custom system prompt for the vision model")
+):
+    """
+    Convert every PDF matching pattern in input_dir to Markdown.
+
+    Each PDF is saved next to its source with a .md extension, overwriting existing files.
+    Conversions run concurrently, bounded by --concurrency to respect provider rate limits.
+
+    Examples:
+        uv run pdf_to_md_flow.py batch papers/
+        uv run pdf_to_md_flow.py batch papers/ --pattern "2024-*.pdf" --concurrency 8
+    """
+    pdf_paths = sorted(
+        p for p in Path(input_dir).glob(pattern)
+        if p.is_file() and p.suffix.lower() == ".pdf"
+    )
+    if not pdf_paths:
+        typer.echo(f"Error: No PDF files matching '{pattern}' in {input_dir}", err=True)
+        raise typer.Exit(code=1)
+
+    console = Console()
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        results = asyncio.run(convert_many(pdf_paths, model, system_prompt, concurrency, progress))
+
+    failures = 0
+    for pdf_path, result in zip(pdf_paths, results):
+        if isinstance(result, BaseException):
+            failures += 1
+            typer.echo(f"Error converting {pdf_path}: {result}", err=True)
+        else:
+            typer.echo(f"PDF converted to Markdown: {result}")
+
+    if failures:
+        raise typer.Exit(code=1)
+
 if __name__ == "__main__":
+    # Before `batch` existed the app had a single command, invoked as
+    # `pdf_to_markdown.py input.pdf [output.md]`; keep that form working
+    if len(sys.argv) > 1 and sys.argv[1] not in ("convert", "batch") and not sys.argv[1].startswith("-"):
+        sys.argv.insert(1, "convert")
     app()
\ No newline at end of file